@@ -1,3 +1,6 @@
+import argparse
+import logging
+
 from src.analyser import Analyser
 from src.config import (
     TICKERS,
@@ -9,6 +12,18 @@ from src.config import (
 )
 
 def main():
+    parser = argparse.ArgumentParser(description="Analyse sector reactions to financial events")
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="ignore the on-disk price cache and re-download from yfinance",
+    )
+    args = parser.parse_args()
+
+    # Buffered, lazily-formatted output; frames are only rendered to
+    # text when the level is enabled
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     analyser = Analyser(
         tickers=TICKERS,
         events=EVENTS,
@@ -17,7 +32,7 @@ def main():
         pre_window=PRE_WINDOW,
         post_window=POST_WINDOW,
     )
-    analyser.run()
+    analyser.run(refresh=args.refresh)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
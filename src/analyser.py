@@ -1,12 +1,68 @@
 __all__ = ["Analyser"]
 
+import hashlib
+import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+
 import numpy as np
 import pandas as pd
+import matplotlib
+
+# Only render figures when an IPython kernel can display them; otherwise
+# use the non-GUI Agg backend and skip plotting work entirely.
+try:
+    from IPython import get_ipython
+    INTERACTIVE = get_ipython() is not None
+except ImportError:
+    INTERACTIVE = False
+
+if not INTERACTIVE:
+    matplotlib.use("Agg")
+elif not logging.getLogger().hasHandlers():
+    # In a notebook nothing configures logging and the last-resort
+    # handler drops INFO records, so the reports would vanish. Attach a
+    # plain stdout handler (widgets.Output captures stdout reliably).
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+
 import matplotlib.pyplot as plt
 import yfinance as yf
 import ipywidgets as widgets
 from ipywidgets import Dropdown
+from numba import njit
 from .strategy import Strategy
+from .config import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+
+@njit(cache=True)
+def _welford_comoments(returns, mkt_col):
+    """
+    Single-pass (Welford) co-moments of every column against mkt_col.
+
+    Returns the unnormalised comoment vector; its mkt_col entry is the
+    market's own sum of squared deviations, so betas are simply
+    comoment / comoment[mkt_col] with the (n-1) factors cancelling.
+    """
+    n, m = returns.shape
+    mean = np.zeros(m)
+    comoment = np.zeros(m)
+    delta_old = np.empty(m)
+
+    for i in range(n):
+        count = i + 1
+        for j in range(m):
+            delta_old[j] = returns[i, j] - mean[j]
+        for j in range(m):
+            mean[j] += delta_old[j] / count
+        d_mkt_new = returns[i, mkt_col] - mean[mkt_col]
+        for j in range(m):
+            comoment[j] += delta_old[j] * d_mkt_new
+
+    return comoment
 
 class Analyser:
     """
@@ -27,30 +83,107 @@ class Analyser:
         self.post_window = post_window
         self.prices = None
         self.strategy = Strategy(tickers=self.tickers, market_ticker="^GSPC")
+        self._zoom_cache = None
 
-    def download_data(self):
+    # Trading-day window sizes padded out to calendar days (~252 trading
+    # days per 365 calendar days, plus slack for holidays).
+    _CALENDAR_PAD = 1.6
+
+    def _event_ranges(self):
+        """
+        Merged calendar date ranges covering every event window, clipped
+        to the configured start/end dates.
+        """
+        if not self.events:
+            return [(pd.Timestamp(self.start_date), pd.Timestamp(self.end_date))]
+
+        start_bound = pd.Timestamp(self.start_date)
+        end_bound = pd.Timestamp(self.end_date)
+        pre_pad = pd.Timedelta(days=int(self.pre_window * self._CALENDAR_PAD) + 7)
+        post_pad = pd.Timedelta(days=int(self.post_window * self._CALENDAR_PAD) + 7)
+
+        ranges = sorted(
+            (max(pd.Timestamp(date) - pre_pad, start_bound),
+             min(pd.Timestamp(date) + post_pad, end_bound))
+            for date, _ in self.events
+        )
+
+        merged = [ranges[0]]
+        for lo, hi in ranges[1:]:
+            if lo <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], hi))
+            elif lo < hi:
+                merged.append((lo, hi))
+        return merged
+
+    def _cache_path(self, ranges):
+        """
+        On-disk cache location, keyed by (tickers, downloaded ranges).
+        """
+        key = repr((
+            tuple(sorted(self.tickers)),
+            tuple((str(lo.date()), str(hi.date())) for lo, hi in ranges),
+        ))
+        digest = hashlib.md5(key.encode()).hexdigest()
+        return Path(CACHE_DIR) / f"prices_{digest}.parquet"
+
+    def download_data(self, refresh=False):
         """
         Download adjusted closing prices for all tickers and drop rows that are entirely NaN.
+
+        Only the (merged) calendar ranges around the configured events are
+        fetched, not the full start-to-end history. Prices are cached to a
+        Parquet file keyed by (tickers, ranges) so repeat runs skip the
+        network entirely; pass refresh=True to force a fresh download.
         """
+        ranges = self._event_ranges()
+        cache_path = self._cache_path(ranges)
+        if not refresh and cache_path.exists():
+            prices = pd.read_parquet(cache_path, memory_map=True)
+            self.prices = self._as_column_major(prices)
+            return
+
         try:
-            prices = yf.download(
-                self.tickers,
-                start=self.start_date,
-                end=self.end_date,
-                auto_adjust=True,
-                progress=False,
-            )["Close"]
+            frames = []
+            for lo, hi in ranges:
+                part = yf.download(
+                    self.tickers,
+                    start=lo,
+                    end=hi,
+                    auto_adjust=True,
+                    progress=False,
+                )["Close"]
+                if isinstance(part, pd.Series):
+                    part = part.to_frame()
+                frames.append(part)
+            prices = pd.concat(frames)
         except Exception as e:
             raise RuntimeError(f"Data download failed: {e}")
 
-        if isinstance(prices, pd.Series):
-            prices = prices.to_frame()
-
+        prices = prices[~prices.index.duplicated()].sort_index()
         prices = prices.dropna(how="all")
         if prices.empty:
             raise ValueError("No valid price data was downloaded. Check tickers and dates.")
 
-        self.prices = prices
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        prices.to_parquet(cache_path, engine="pyarrow")
+
+        self.prices = self._as_column_major(prices)
+
+    @staticmethod
+    def _as_column_major(prices):
+        """
+        Rebuild the frame on a Fortran-ordered float32 block so the
+        per-ticker reductions downstream (var, cov, min/std over axis 0)
+        walk contiguous memory and the whole history fits in half the
+        cache footprint. float32 keeps ~7 significant digits, far more
+        than daily prices carry.
+        """
+        return pd.DataFrame(
+            np.asfortranarray(prices.to_numpy(dtype=np.float32)),
+            index=prices.index,
+            columns=prices.columns,
+        )
 
 
     def get_event_window(self, event_date):
@@ -60,16 +193,23 @@ class Analyser:
         if self.prices is None:
             raise RuntimeError("Call download_data() first.")
 
-        event_dt = pd.to_datetime(event_date)
-        nearest = self.prices.index.get_indexer([event_dt], method="nearest")[0]
-        event_dt = self.prices.index[nearest]
-        idx = self.prices.index.get_loc(event_dt)
-        print(f" Using nearest trading day to {event_date}: {event_dt.date()}")
+        # One binary search for the nearest trading day, instead of the
+        # to_datetime + get_indexer + get_loc chain
+        index = self.prices.index
+        target = pd.Timestamp(event_date)
+        idx = index.searchsorted(target)
+        if idx == len(index):
+            idx -= 1
+        elif idx > 0 and target - index[idx - 1] <= index[idx] - target:
+            idx -= 1
+        event_dt = index[idx]
 
         start = max(0, idx - self.pre_window)
         end = min(len(self.prices), idx + self.post_window + 1)
 
-        window = self.prices.iloc[start:end].copy().sort_index()
+        # The index is already sorted and callers never mutate the
+        # window, so hand out a cheap view rather than a sorted copy
+        window = self.prices.iloc[start:end]
         return window, event_dt
 
     def normalise(self, window, event_dt):
@@ -83,13 +223,14 @@ class Analyser:
         """
         Pre- and post-event returns from normalised prices.
 
-        Assumes the event day is normalised to 1 and is contained in norm_prices.
+        Assumes norm_prices is indexed by days relative to the event, with the
+        event day (relative day 0) normalised to 1.
         pre_return: return from FIRST visible day to the event day.
         post_return: return from the event day to the LAST visible day.
         """
-        # Safety: ensure event day (1.0) is present
-        if not (np.isclose(norm_prices, 1.0).any().any()):
-            raise ValueError("Event day (value 1.0) not present in norm_prices.")
+        # Safety: ensure event day is present (O(1), no value scan)
+        if 0 not in norm_prices.index:
+            raise ValueError("Event day (relative day 0) not present in norm_prices.")
 
         first = norm_prices.iloc[0]
         last  = norm_prices.iloc[-1]
@@ -104,22 +245,31 @@ class Analyser:
         """
         Compute beta of each sector relative to the market
         """
-        returns = window.pct_change().dropna() #no value before first col
-
-        if market_ticker not in returns.columns:
+        if market_ticker not in window.columns:
             raise ValueError(f"Market ticker {market_ticker} not found in returns")
 
-        market = returns[market_ticker]
-        var_mkt = market.var()
-
-        betas = {}
-        for col in returns.columns:
-            if col == market_ticker:
-                continue
-            cov = returns[col].cov(market)
-            betas[col] = cov / var_mkt
-
-        return pd.Series(betas, name="beta")
+        # Plain ratio of consecutive rows; same as pct_change().dropna()
+        # without the intermediate frame. Rows with a missing quote in
+        # any column are masked out, matching the dropna() behaviour.
+        vals = window.to_numpy(dtype=np.float64)
+        returns = vals[1:] / vals[:-1] - 1.0
+        returns = np.ascontiguousarray(returns[np.isfinite(returns).all(axis=1)])
+
+        mkt_col = window.columns.get_loc(market_ticker)
+        if len(returns) < 2:
+            betas = pd.Series(np.nan, index=window.columns, name="beta")
+            return betas.drop(market_ticker)
+
+        # Welford co-moments against the market in a single pass, rather
+        # than a full covariance matrix (or per-column cov/var calls)
+        comoment = _welford_comoments(returns, mkt_col)
+        var_mkt = comoment[mkt_col]
+
+        if var_mkt == 0:
+            betas = pd.Series(np.nan, index=window.columns, name="beta")
+        else:
+            betas = pd.Series(comoment / var_mkt, index=window.columns, name="beta")
+        return betas.drop(market_ticker)
 
     def plot_event(self, norm_prices, event_dt, label):
         """
@@ -154,17 +304,36 @@ class Analyser:
         plt.tight_layout()
         plt.gcf().autofmt_xdate()
         plt.show()
+        plt.close(fig)
 
 
-    def draw_zoom_plot(self, norm_rel, label, zoom):
+    def _zoom_arrays(self, norm_rel):
         """
-        Draw interactive plot on a relative day index around the event.
+        NumPy view of norm_rel plus legend labels, cached on the analyser
+        so zoom callbacks don't redo the conversion and column lookups.
+        """
+        cache = self._zoom_cache
+        if cache is None or cache["frame"] is not norm_rel:
+            cache = self._zoom_cache = {
+                "frame": norm_rel,
+                "values": norm_rel.to_numpy(),
+                "rel_days": norm_rel.index.to_numpy(),
+                "labels": [self.LABELS.get(col, col) for col in norm_rel.columns],
+            }
+        return cache
+
+    def _build_zoom_fig(self, norm_rel, label, zoom):
         """
-        plt.figure(figsize=(7, 4))
+        Build the zoomed figure on a relative day index around the event.
+        """
+        cache = self._zoom_arrays(norm_rel)
+        values = cache["values"]
+        rel_days = cache["rel_days"]
 
-        for col in norm_rel.columns:
-            label_name = self.LABELS.get(col, col)
-            plt.plot(norm_rel.index, norm_rel[col], label=label_name)
+        fig = plt.figure(figsize=(7, 4))
+
+        for j, label_name in enumerate(cache["labels"]):
+            plt.plot(rel_days, values[:, j], label=label_name)
 
         plt.axvline(0, linestyle="--")
 
@@ -172,17 +341,16 @@ class Analyser:
         plt.xlabel("Days relative to event")
         plt.ylabel("Normalised Price")
 
-        left = -zoom
-        right = zoom
-        left = max(left, norm_rel.index.min())
-        right = min(right, norm_rel.index.max())
+        left = max(-zoom, rel_days[0])
+        right = min(zoom, rel_days[-1])
         plt.xlim(left, right)
 
-        mask = (norm_rel.index >= left) & (norm_rel.index <= right)
-        visible = norm_rel[mask]
+        lo = np.searchsorted(rel_days, left, side="left")
+        hi = np.searchsorted(rel_days, right, side="right")
+        visible = values[lo:hi]
 
-        y_min = visible.min().min()
-        y_max = visible.max().max()
+        y_min = np.nanmin(visible) if visible.size else np.nan
+        y_max = np.nanmax(visible) if visible.size else np.nan
 
         if not np.isfinite(y_min) or not np.isfinite(y_max) or y_max == y_min:
             plt.ylim(0.95, 1.05)
@@ -193,7 +361,15 @@ class Analyser:
         plt.grid(True)
         plt.legend()
         plt.tight_layout()
+        return fig
+
+    def draw_zoom_plot(self, norm_rel, label, zoom):
+        """
+        Draw interactive plot on a relative day index around the event.
+        """
+        fig = self._build_zoom_fig(norm_rel, label, zoom)
         plt.show()
+        plt.close(fig)
 
 
     def plot_event_interactive(self, norm_rel, window_rel, label):
@@ -215,83 +391,151 @@ class Analyser:
         ]
         options = [(txt, min(days, max_range)) for txt, days in raw_options]
 
-        def _update(zoom):
-            self.draw_zoom_plot(norm_rel, label, zoom)
+        # Slice positions per zoom level, computed once instead of
+        # rebuilding a boolean mask on every callback.
+        rel_days = norm_rel.index.to_numpy()
+        slice_bounds = {
+            days: (
+                np.searchsorted(rel_days, -days, side="left"),
+                np.searchsorted(rel_days, days, side="right"),
+            )
+            for _, days in options
+        }
+
+        # Metrics and renderings for each zoom level are deterministic,
+        # so compute them once and replay from the caches when the user
+        # revisits a level.
+        results_cache = {}
+        figure_cache = {}
+
+        def _show_zoom_plot(zoom):
+            # The inline backend emits figures as static images, so an
+            # in-place set_xlim/draw_idle update never reaches the
+            # frontend; replaying a cached PNG render is the next best
+            # thing and skips figure construction entirely on revisits.
+            from IPython.display import Image, display
+
+            png = figure_cache.get(zoom)
+            if png is None:
+                fig = self._build_zoom_fig(norm_rel, label, zoom)
+                buf = BytesIO()
+                fig.savefig(buf, format="png")
+                plt.close(fig)
+                png = figure_cache[zoom] = buf.getvalue()
+            display(Image(data=png))
+
+        def _compute(zoom):
+            if zoom not in results_cache:
+                lo, hi = slice_bounds[zoom]
+                norm_slice   = norm_rel.iloc[lo:hi]
+                window_slice = window_rel.iloc[lo:hi]
+
+                metrics_zoom = (
+                    self.compute_metrics(norm_slice) if len(norm_slice) >= 2 else None
+                )
+                betas_zoom = (
+                    self.compute_beta(window_slice) if len(window_slice) >= 2 else None
+                )
+
+                summary_zoom = None
+                if (metrics_zoom is not None) and (betas_zoom is not None):
+                    summary_zoom = self.strategy.build_summary(
+                        metrics=metrics_zoom,
+                        betas=betas_zoom,
+                        norm_rel=norm_slice,
+                        window_rel=window_slice,
+                    )
+                results_cache[zoom] = (metrics_zoom, betas_zoom, summary_zoom)
+            return results_cache[zoom]
 
-            mask = (norm_rel.index >= -zoom) & (norm_rel.index <= zoom)
-            norm_slice   = norm_rel.loc[mask]
-            window_slice = window_rel.loc[mask]
+        def _update(zoom):
+            if INTERACTIVE:
+                _show_zoom_plot(zoom)
 
-            print(f"\n--- Zoom ±{zoom} days ---")
+            metrics_zoom, betas_zoom, summary_zoom = _compute(zoom)
 
-            metrics_zoom = None
-            betas_zoom = None
+            logger.info("\n--- Zoom ±%s days ---", zoom)
 
-            if len(norm_slice) >= 2:
-                metrics_zoom = self.compute_metrics(norm_slice)
-                print("Zoomed pre and post event returns:")
-                print(" pre_return = change from the FIRST visible day to the event day")
-                print(" post_return = change from the event day to the LAST visible day\n")
-                print(metrics_zoom)
+            if metrics_zoom is not None:
+                logger.info(
+                    "Zoomed pre and post event returns:\n"
+                    " pre_return = change from the FIRST visible day to the event day\n"
+                    " post_return = change from the event day to the LAST visible day\n\n%s",
+                    metrics_zoom,
+                )
             else:
-                print("Not enough data for pre/post metrics in this zoom.\n")
-
-            if len(window_slice) >= 2:
-                betas_zoom = self.compute_beta(window_slice)
-                print("\nZoomed beta values (sensitivity to market movements):")
-                print(" A beta > 1 means the sector moves more than the market.")
-                print(" A beta < 1 means the sector moves less than the market.")
-                print(" A negative beta means the sector moved opposite the market.\n")
-                print(betas_zoom)
+                logger.info("Not enough data for pre/post metrics in this zoom.\n")
+
+            if betas_zoom is not None:
+                logger.info(
+                    "\nZoomed beta values (sensitivity to market movements):\n"
+                    " A beta > 1 means the sector moves more than the market.\n"
+                    " A beta < 1 means the sector moves less than the market.\n"
+                    " A negative beta means the sector moved opposite the market.\n\n%s",
+                    betas_zoom,
+                )
             else:
-                print("Not enough data for betas in this zoom.\n")
+                logger.info("Not enough data for betas in this zoom.\n")
 
             # Zoom-dependent strategy summary
-            if (metrics_zoom is not None) and (betas_zoom is not None):
-                summary_zoom = self.strategy.build_summary(
-                    metrics=metrics_zoom,
-                    betas=betas_zoom,
-                    norm_rel=norm_slice,
-                    window_rel=window_slice,
-                )
+            if summary_zoom is not None:
                 self.strategy.print_recommendations(
                     summary_zoom,
                     event_label=label,
                     zoom=zoom,
                 )
             else:
-                print("Not enough data for strategy summary in this zoom.\n")
-
-        widgets.interact(
-            _update,
-            zoom=Dropdown(
-                options=options,
-                description="Zoom range",
-            ),
-        )
+                logger.info("Not enough data for strategy summary in this zoom.\n")
 
+        if INTERACTIVE:
+            from IPython.display import display
 
+            dropdown = Dropdown(options=options, description="Zoom range")
+            output = widgets.Output()
 
-    def run(self):
-        self.download_data()
+            def _on_change(change):
+                with output:
+                    output.clear_output(wait=True)
+                    _update(change["new"])
 
-        for date, label in self.events:
-            print(f"{label} (date of event: {date})")
+            dropdown.observe(_on_change, names="value")
+            display(dropdown, output)
+            with output:
+                _update(dropdown.value)
+        else:
+            # No widgets without a kernel: report the full window once.
+            _update(max_range)
 
-            window, event_dt = self.get_event_window(date)
-            norm = self.normalise(window, event_dt)
 
-            # Static plot (calendar dates)
-            self.plot_event(norm, event_dt, label)
 
-            # Build relative-day indices for window and norm
-            rel_days = (window.index - event_dt).days
+    def _prepare_event(self, date):
+        """
+        Window extraction, normalisation and relative-day reindexing for
+        one event. Pure array work, safe to run off the main thread.
+        """
+        window, event_dt = self.get_event_window(date)
+        norm = self.normalise(window, event_dt)
+
+        # One int32 relative-day index, shared by window and norm
+        rel_index = pd.Index((window.index - event_dt).days.astype(np.int32))
+
+        return event_dt, norm, window.set_axis(rel_index), norm.set_axis(rel_index)
 
-            window_rel = window.copy()
-            window_rel.index = rel_days
+    def run(self, refresh=False):
+        self.download_data(refresh=refresh)
 
-            norm_rel = norm.copy()
-            norm_rel.index = rel_days
+        # Prepare all events in parallel (NumPy releases the GIL for the
+        # array work); plotting and widgets stay on the main thread
+        with ThreadPoolExecutor() as pool:
+            prepared = list(pool.map(self._prepare_event, (d for d, _ in self.events)))
+
+        for (date, label), (event_dt, norm, window_rel, norm_rel) in zip(self.events, prepared):
+            logger.info("%s (date of event: %s)", label, date)
+            logger.info(" Using nearest trading day to %s: %s", date, event_dt.date())
+
+            # Static plot (calendar dates)
+            if INTERACTIVE:
+                self.plot_event(norm, event_dt, label)
 
             # Only interactive (zoom-dependent) stuff from here:
             self.plot_event_interactive(norm_rel, window_rel, label)
\ No newline at end of file
@@ -10,4 +10,6 @@ EVENTS = [
 ]
 
 PRE_WINDOW  = 1825
-POST_WINDOW = 1825
\ No newline at end of file
+POST_WINDOW = 1825
+
+CACHE_DIR = "data_cache"
\ No newline at end of file
@@ -1,6 +1,43 @@
+import logging
+
 import numpy as np
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
+
+def _recovery_days_kernel(values, rel_days):
+    """
+    For each column: pre-event peak, post-event trough, then the first
+    post-trough day at or above the pre-event peak. np.inf if there is
+    no pre-event data or the column never recovers.
+
+    All columns are scanned at once: the running minimum from
+    np.fmin.accumulate (NaN-ignoring) equals the trough exactly from
+    the trough onward, which marks the recovery phase without
+    per-column loops.
+    """
+    out = np.full(values.shape[1], np.inf)
+
+    pre = values[rel_days < 0]
+    post_mask = rel_days > 0
+    post = values[post_mask]
+    if len(pre) == 0 or len(post) == 0:
+        return out
+
+    pre_peak = np.nanmax(pre, axis=0)
+    run_min = np.fmin.accumulate(post, axis=0)
+    trough = run_min[-1]
+
+    recovered = (run_min == trough) & (post >= pre_peak)
+    has_rec = recovered.any(axis=0)
+    first = recovered.argmax(axis=0)
+
+    post_days = rel_days[post_mask]
+    out[has_rec] = post_days[first[has_rec]]
+    return out
+
+
 class Strategy:
     """
     Compute investment recommendations from price behaviour after event
@@ -9,6 +46,8 @@ class Strategy:
         # Only for tickers that aren't the market (s&p500)
         self.market_ticker = market_ticker
         self.tickers = [t for t in tickers if t != market_ticker]
+        # O(1) membership tests; the list above keeps column order
+        self._ticker_set = frozenset(self.tickers)
 
     def max_drawdown(self, norm_rel: pd.DataFrame) -> pd.Series:
         """
@@ -23,36 +62,13 @@ class Strategy:
         """
         Days from the minimum drawdown point until the price returns to its pre event peak level
         """
-        rec_days = {}
+        cols = [c for c in norm_rel.columns if c in self._ticker_set]
 
-        for col in norm_rel.columns:
-            if col not in self.tickers:
-                continue
+        values = norm_rel[cols].to_numpy(dtype=np.float64)
+        rel_days = norm_rel.index.to_numpy(dtype=np.int64)
 
-            # Pre-event peak
-            pre = norm_rel.loc[norm_rel.index < 0, col]
-            if pre.empty:
-                rec_days[col] = np.inf
-                continue
-
-            pre_peak = pre.max()
-
-            # Post-event behaviour
-            post = norm_rel.loc[norm_rel.index > 0, col]
-
-            # Worst drawdown point
-            trough_idx = post.idxmin()
-
-            # From trough onward, check when get to the pre event peak
-            recovery_phase = post.loc[post.index >= trough_idx]
-            recovered = recovery_phase[recovery_phase >= pre_peak]
-
-            if len(recovered) == 0:
-                rec_days[col] = np.inf
-            else:
-                rec_days[col] = int(recovered.index[0])
-
-        return pd.Series(rec_days, name="days_to_recovery")
+        rec = _recovery_days_kernel(values, rel_days)
+        return pd.Series(rec, index=cols, name="days_to_recovery")
 
 
 
@@ -77,6 +93,10 @@ class Strategy:
         """
         Combine all metrics into a single DataFrame:
         pre/post returns, max drawdown, volatility, recovery days, beta.
+
+        Drawdown, volatility and recovery days are computed from one
+        NumPy conversion of the windows rather than three separate
+        pandas passes.
         """
         # Align everything on the same index (tickers)
         tickers = [t for t in self.tickers if t in metrics.index]
@@ -85,13 +105,24 @@ class Strategy:
         summary["pre_return"] = metrics["pre_return"].reindex(tickers)
         summary["post_return"] = metrics["post_return"].reindex(tickers)
 
-        dd = self.max_drawdown(norm_rel)
-        vol = self.post_event_volatility(window_rel)
-        rec = self.recovery_days(norm_rel)
+        norm_vals = norm_rel[tickers].to_numpy(dtype=np.float64)
+        win_vals = window_rel[tickers].to_numpy(dtype=np.float64)
+        rel_days = norm_rel.index.to_numpy(dtype=np.int64)
+
+        dd = 1.0 - np.nanmin(norm_vals, axis=0)
+
+        post = win_vals[rel_days >= 0]
+        if len(post) >= 3:
+            rets = post[1:] / post[:-1] - 1.0
+            vol = np.nanstd(rets, axis=0, ddof=1)
+        else:
+            vol = np.full(len(tickers), np.nan)
+
+        rec = _recovery_days_kernel(norm_vals, rel_days)
 
-        summary["max_drawdown"] = dd.reindex(tickers)
-        summary["volatility"] = vol.reindex(tickers)
-        summary["days_to_recovery"] = rec.reindex(tickers)
+        summary["max_drawdown"] = dd
+        summary["volatility"] = vol
+        summary["days_to_recovery"] = rec
         summary["beta"] = betas.reindex(tickers)
 
         return summary
@@ -104,13 +135,13 @@ class Strategy:
         currently visible slice of data.
         """
         if summary.empty:
-            print("No strategy summary available in this zoom window.\n")
+            logger.info("No strategy summary available in this zoom window.\n")
             return
 
-        print("\nZoomed strategy summary "
-            f"for {event_label} (±{zoom} days):")
-        print(summary)
-        print()
+        logger.info(
+            "\nZoomed strategy summary for %s (±%s days):\n%s\n",
+            event_label, zoom, summary,
+        )
 
         # Defensive: lowest post-event volatility
         defensive = summary["volatility"].idxmin()
@@ -118,20 +149,21 @@ class Strategy:
         # Growth / momentum: highest post-event return
         growth = summary["post_return"].idxmax()
 
-        # Fastest recovery: smallest finite days_to_recovery
-        recovery_series = summary["days_to_recovery"].replace(np.inf, np.nan)
-        fast_rec = recovery_series.idxmin() if recovery_series.notna().any() else None
+        # Fastest recovery: smallest finite days_to_recovery, found with
+        # a mask instead of materialising an inf-to-NaN copy
+        rec_vals = summary["days_to_recovery"].to_numpy()
+        finite = np.isfinite(rec_vals)
+        fast_rec = summary.index[rec_vals.argmin()] if finite.any() else None
 
-        print("Investor recommendations:")
-        print(f" - Defensive investor: consider {defensive} "
-            f"(lowest post-event volatility in this window).")
-        print(f" - Growth-seeking investor: consider {growth} "
-            f"(highest post-event return in this window).")
+        logger.info("Investor recommendations:")
+        logger.info(" - Defensive investor: consider %s "
+            "(lowest post-event volatility in this window).", defensive)
+        logger.info(" - Growth-seeking investor: consider %s "
+            "(highest post-event return in this window).", growth)
 
         if fast_rec is not None:
-            print(f" - Focused on quick recovery: consider {fast_rec} "
-                f"(fastest recovery to pre-event level in this window).")
+            logger.info(" - Focused on quick recovery: consider %s "
+                "(fastest recovery to pre-event level in this window).\n", fast_rec)
         else:
-            print(" - No asset fully recovered to its pre-event level "
-                "within this zoom window.")
-        print()
\ No newline at end of file
+            logger.info(" - No asset fully recovered to its pre-event level "
+                "within this zoom window.\n")
\ No newline at end of file
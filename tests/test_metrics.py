@@ -1,6 +1,7 @@
 import numpy as np
 import pandas as pd
 
+from src.analyser import Analyser
 from src.strategy import Strategy
 
 
@@ -51,14 +52,63 @@ def test_recovery_day_detection_matches_expected():
     assert rec["X"] == 3, "Recovery-day detection failed"
 
 
+def test_recovery_day_detection_skips_missing_quotes():
+    rel_days = np.array([-2, -1, 0, 1, 2, 3])
+    values = pd.DataFrame(
+        {"X": [1.2, 1.1, 1.0, 0.7, np.nan, 1.3]},
+        index=rel_days,
+    )
+
+    strat = Strategy(tickers=["^GSPC", "X"], market_ticker="^GSPC")
+    rec = strat.recovery_days(values)
+
+    assert rec["X"] == 3, "A NaN in the post-event window broke recovery detection"
+
+
+def test_event_window_snaps_to_nearest_trading_day():
+    dates = pd.to_datetime(["2020-01-06", "2020-01-07", "2020-01-10"])
+    analyser = Analyser(
+        tickers=["A"], events=[], start_date="2020-01-01", end_date="2020-01-31",
+        pre_window=1, post_window=1,
+    )
+    analyser.prices = pd.DataFrame({"A": [1.0, 2.0, 3.0]}, index=dates)
+
+    # 2020-01-08 is closer to the 7th than the 10th
+    window, event_dt = analyser.get_event_window("2020-01-08")
+
+    assert event_dt == dates[1], "Did not snap to nearest trading day"
+    assert len(window) == 3, "Window size incorrect"
+
+
 def test_beta_calculation_equals_two_for_2x_sector():
-    market = pd.Series([0.01, 0.02, 0.03])
-    sector = 2 * market
+    market_returns = np.array([0.01, 0.02, -0.01, 0.03])
+    market = 100 * np.concatenate([[1.0], np.cumprod(1 + market_returns)])
+    sector = 50 * np.concatenate([[1.0], np.cumprod(1 + 2 * market_returns)])
+
+    window = pd.DataFrame({"^GSPC": market, "X": sector})
 
-    returns = pd.DataFrame({"^GSPC": market, "X": sector})
+    analyser = Analyser(
+        tickers=["^GSPC", "X"], events=[], start_date="2020-01-01",
+        end_date="2020-01-31", pre_window=1, post_window=1,
+    )
+    beta = analyser.compute_beta(window)
 
-    cov = returns["X"].cov(returns["^GSPC"])
-    var = returns["^GSPC"].var()
-    beta = cov / var
+    assert abs(beta["X"] - 2) < 1e-6, "Beta calculation incorrect"
+
+
+def test_beta_calculation_ignores_missing_quotes():
+    market_returns = np.array([0.01, 0.02, -0.01, 0.03, 0.015])
+    market = 100 * np.concatenate([[1.0], np.cumprod(1 + market_returns)])
+    sector = 50 * np.concatenate([[1.0], np.cumprod(1 + 2 * market_returns)])
+
+    window = pd.DataFrame({"^GSPC": market, "X": sector})
+    window.loc[2, "X"] = np.nan
+
+    analyser = Analyser(
+        tickers=["^GSPC", "X"], events=[], start_date="2020-01-01",
+        end_date="2020-01-31", pre_window=1, post_window=1,
+    )
+    beta = analyser.compute_beta(window)
 
-    assert abs(beta - 2) < 1e-6, "Beta calculation incorrect"
\ No newline at end of file
+    assert np.isfinite(beta["X"]), "A single NaN quote made the beta NaN"
+    assert abs(beta["X"] - 2) < 1e-6, "Beta incorrect on the remaining rows"
\ No newline at end of file